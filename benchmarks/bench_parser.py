@@ -0,0 +1,180 @@
+"""Micro-benchmarks for parsing, filtering and serializing infoportal data.
+
+Pages come from the fake infoportal generator, so results are reproducible
+and need no network access::
+
+    python -m benchmarks.bench_parser --days 5 --rows 200
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable
+
+from pydantic import TypeAdapter
+
+from benchmarks.fake_infoportal import FakeInfoportalSettings, InfoportalHTMLGenerator
+from src.models.config_model import Config
+from src.models.match_mode_model import MatchMode
+from src.models.news_message_model import NewsMessage
+from src.models.substitution_model import Substitution
+from src.parser import Parser
+from src.substitution_manager import SubstitutionManager
+
+
+def measure(func: Callable[[], object], repeat: int, number: int) -> list[float]:
+    """Run func number times per round and return seconds per call for each round."""
+    func()  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return timings
+
+
+def report(name: str, timings: list[float], items: int = 0) -> None:
+    best = min(timings)
+    median = statistics.median(timings)
+    line = f"{name:<32} best {best * 1000:9.3f} ms   median {median * 1000:9.3f} ms"
+    if items:
+        line += f"   {items / median:12,.0f} items/s"
+    print(line)
+
+
+def parse_page(config: Config, raw_html: str) -> Parser:
+    parser = Parser(config)
+    parser.setup_parsing(raw_html)
+    return parser
+
+
+def run(settings: FakeInfoportalSettings, repeat: int, number: int) -> None:
+    config = Config(days=settings.days, show_news=settings.news_blocks > 0)
+    raw_html = InfoportalHTMLGenerator(settings).render_page(news=config.show_news)
+
+    parser = parse_page(config, raw_html)
+    substitutions = parser.parse_substitutions()
+    news = parser.parse_news()
+    manager = SubstitutionManager("bench", substitutions, news, parser.parse_last_updated())
+
+    rows = settings.days * settings.rows_per_day
+    print(
+        f"page: {len(raw_html) / 1024:.1f} KiB, {rows} rows, "
+        f"{len(manager.substitutions)} substitutions, {len(news)} news"
+    )
+
+    # --- Parse ---
+    report("parse: soup", measure(lambda: parse_page(config, raw_html), repeat, number))
+    report(
+        "parse: substitutions",
+        measure(parser.parse_substitutions, repeat, number),
+        items=rows,
+    )
+    tables = parser._substitution_tables or []
+    day = manager.substitutions[0].date
+    cell_rows = [
+        [cell.get_text().strip() for cell in row.find_all("td")]
+        for table in tables
+        for row in table.find("table").find_all("tr")[1:]
+    ]
+    report(
+        "convert: rows",
+        measure(lambda: parser._convert_rows_to_substitutions(cell_rows, day), repeat, number),
+        items=rows,
+    )
+    report("parse: news", measure(parser.parse_news, repeat, number))
+    report("parse: last updated", measure(parser.parse_last_updated, repeat, number))
+    report(
+        "parse: full page",
+        measure(
+            lambda: SubstitutionManager(
+                "bench",
+                (p := parse_page(config, raw_html)).parse_substitutions(),
+                p.parse_news(),
+                p.parse_last_updated(),
+            ),
+            repeat,
+            number,
+        ),
+        items=rows,
+    )
+
+    # --- Filter ---
+    sample = manager.substitutions[len(manager.substitutions) // 2]
+    report("filter: all", measure(manager.get_all_substitutions, repeat, number))
+    report(
+        "filter: class",
+        measure(lambda: manager.get_substitutions_for_class(sample.class_name), repeat, number),
+    )
+    report(
+        "filter: teacher",
+        measure(
+            lambda: manager.get_substitutions_with_property(
+                "absent_teacher", sample.absent_teacher
+            ),
+            repeat,
+            number,
+        ),
+    )
+    report(
+        "filter: class prefix",
+        measure(
+            lambda: manager.get_substitutions_for_class(
+                sample.class_name[:-1], match=MatchMode.prefix
+            ),
+            repeat,
+            number,
+        ),
+    )
+    report(
+        "filter: teacher fuzzy",
+        measure(
+            lambda: manager.get_substitutions_with_property(
+                "absent_teacher", sample.absent_teacher[:-1], match=MatchMode.fuzzy
+            ),
+            repeat,
+            number,
+        ),
+    )
+    report(
+        "filter: date",
+        measure(lambda: manager.get_all_substitutions(date=sample.date), repeat, number),
+    )
+
+    # --- Serialize ---
+    substitution_adapter = TypeAdapter(list[Substitution])
+    news_adapter = TypeAdapter(list[NewsMessage])
+    all_substitutions = manager.get_all_substitutions()
+    report(
+        "serialize: substitutions",
+        measure(lambda: substitution_adapter.dump_json(all_substitutions), repeat, number),
+        items=len(all_substitutions),
+    )
+    report(
+        "serialize: news",
+        measure(lambda: news_adapter.dump_json(manager.get_all_news_messages()), repeat, number),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parser/manager micro-benchmarks")
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--rows", type=int, default=40, help="rows per day")
+    parser.add_argument("--news-blocks", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    settings = FakeInfoportalSettings(
+        days=args.days,
+        rows_per_day=args.rows,
+        news_blocks=args.news_blocks,
+        seed=args.seed,
+    )
+    run(settings, args.repeat, args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""Local stand-in for schule-infoportal.de used by the benchmark suite.
+
+Generates infoscreen HTML in the same shape the real portal serves (one
+daily table per day, merged class rows like "10abc", continuation rows with
+an empty class cell, a news column and the copyright footer) and serves it
+over HTTP with optional latency and failure injection.
+
+Run standalone with ``python -m benchmarks.fake_infoportal --port 8081`` and
+point ``Config.infoportal_url`` at it.
+"""
+
+import argparse
+import base64
+import datetime
+import html
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+from pydantic import BaseModel
+
+from src.utils.setup_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+WEEKDAYS = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"]
+TEACHERS = [
+    "Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner",
+    "Becker", "Schulz", "Hoffmann", "Schäfer", "Koch", "Bauer", "Richter",
+    "Klein", "Wolf", "Schröder", "Neumann", "Schwarz", "Zimmermann",
+]
+ROOMS = ["101", "102", "103", "114", "201", "207", "215", "Turnhalle", "Aula", "NW1"]
+INFOS = ["entfällt", "Vertretung", "Raumänderung", "Aufgaben", "verlegt", ""]
+NEWS_TEXTS = [
+    "Die Bibliothek bleibt heute geschlossen.",
+    "Am Freitag findet der Wandertag statt.",
+    "Die Mensa bietet ab sofort ein vegetarisches Tagesgericht an.",
+    "Elternsprechtag am kommenden Donnerstag.",
+    "Fundsachen bitte im Sekretariat abholen.",
+    "Die Theater-AG probt in der Aula.",
+]
+
+
+class FakeInfoportalSettings(BaseModel):
+    days: int = 3
+    rows_per_day: int = 40
+    grades: list[int] = [5, 6, 7, 8, 9, 10, 11]
+    class_letters: str = "abcdef"
+    merged_ratio: float = 0.15  # share of rows with merged classes like "10abc"
+    continuation_ratio: float = 0.2  # share of rows with an empty class cell
+    upper_school_ratio: float = 0.1  # share of rows for Q12/Q13
+    news_blocks: int = 3
+    messages_per_block: int = 2
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    failure_rate: float = 0.0  # probability of answering with failure_status
+    failure_status: int = 503
+    password: Optional[str] = None  # None accepts every login
+    seed: int = 0
+    start_date: Optional[datetime.date] = None  # defaults to today
+
+
+class InfoportalHTMLGenerator:
+    """Builds deterministic infoscreen pages from FakeInfoportalSettings.
+
+    Each day is generated from its own seed, so a page covering several days
+    contains exactly the same rows as pages fetched for the single days.
+    """
+
+    def __init__(self, settings: FakeInfoportalSettings):
+        self.settings = settings
+
+    @property
+    def start_date(self) -> datetime.date:
+        return self.settings.start_date or datetime.date.today()
+
+    def render_page(
+        self,
+        days: Optional[int] = None,
+        future: int = 0,
+        news: bool = True,
+        updated_at: Optional[datetime.datetime] = None,
+    ) -> str:
+        days = self.settings.days if days is None else days
+        first_day = self.start_date + datetime.timedelta(days=future)
+        updated_at = updated_at or datetime.datetime.combine(
+            self.start_date, datetime.time(7, 30)
+        )
+
+        cells = [
+            f"<td>{self.render_day(first_day + datetime.timedelta(days=i))}</td>"
+            for i in range(days)
+        ]
+        if news:
+            cells.append(f"<td>{self.render_news(first_day)}</td>")
+
+        return (
+            "<!DOCTYPE html><html><head><title>Infoscreen</title></head><body>"
+            f'<table class="main-table"><tr>{"".join(cells)}</tr></table>'
+            '<div class="copyright"><div>'
+            f"Letzte Aktualisierung: {updated_at.strftime('%d.%m.%Y %H:%M:%S')}"
+            "</div></div></body></html>"
+        )
+
+    def render_day(self, day: datetime.date) -> str:
+        rng = random.Random(self.settings.seed * 1_000_003 + day.toordinal())
+        week = "week_odd" if day.isocalendar()[1] % 2 else "week_even"
+        header = (
+            f"{WEEKDAYS[day.weekday()]}, {day.strftime('%d.%m.%Y')} - "
+            f"{'A' if week == 'week_odd' else 'B'}-Woche"
+        )
+
+        rows = [
+            "<tr><th>Klasse</th><th>Stunde</th><th>Abwesend</th>"
+            "<th>Vertretung</th><th>Raum</th><th>Info</th></tr>"
+        ]
+        for i in range(self.settings.rows_per_day):
+            rows.append(self._render_row(rng, first=i == 0))
+
+        return (
+            '<div class="container daily_table">'
+            f'<div class="daily_date_hdl {week}">{header}</div>'
+            f'<table>{"".join(rows)}</table>'
+            "</div>"
+        )
+
+    def render_news(self, first_day: datetime.date) -> str:
+        rng = random.Random(self.settings.seed * 1_000_003 - first_day.toordinal())
+        blocks = []
+        for i in range(self.settings.news_blocks):
+            day = first_day + datetime.timedelta(days=i % max(self.settings.days, 1))
+            messages = rng.sample(
+                NEWS_TEXTS, min(self.settings.messages_per_block, len(NEWS_TEXTS))
+            )
+            text = "\n\n".join(f"*{html.escape(m)}*" for m in messages)
+            blocks.append(
+                '<div class="news bb_border bb_bg_weiss">'
+                f'<p class="news_headline_2">{day.strftime("%d.%m.%Y")}</p>'
+                f'<span class="news_text">{text}</span>'
+                "</div>"
+            )
+        return "".join(blocks)
+
+    def _render_row(self, rng: random.Random, first: bool) -> str:
+        settings = self.settings
+        roll = rng.random()
+
+        if not first and roll < settings.continuation_ratio:
+            class_name = ""
+        elif roll < settings.continuation_ratio + settings.upper_school_ratio:
+            class_name = rng.choice(["Q12", "Q13"])
+        else:
+            grade = rng.choice(settings.grades)
+            letters = settings.class_letters
+            if rng.random() < settings.merged_ratio:
+                count = rng.randint(2, min(4, len(letters)))
+                start = rng.randint(0, len(letters) - count)
+                class_name = f"{grade}{letters[start:start + count]}"
+            else:
+                class_name = f"{grade}{rng.choice(letters)}"
+
+        period = str(rng.randint(1, 10))
+        if rng.random() < 0.2:
+            period = f"{period} - {int(period) + 1}"
+
+        info = rng.choice(INFOS)
+        substitute = "---" if info == "entfällt" else rng.choice(TEACHERS)
+        cells = [
+            class_name,
+            period,
+            rng.choice(TEACHERS),
+            substitute,
+            rng.choice(ROOMS),
+            info,
+        ]
+        return "<tr>" + "".join(f"<td>{html.escape(c)}</td>" for c in cells) + "</tr>"
+
+
+class _InfoportalRequestHandler(BaseHTTPRequestHandler):
+    server: "_InfoportalHTTPServer"
+
+    def do_GET(self):
+        fake = self.server.fake
+        settings = fake.settings
+
+        delay = settings.latency_ms + fake.rng.uniform(0, settings.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        if not self._is_authorized(settings.password):
+            fake.record_request(failed=False)
+            self._send(401, "Unauthorized", {"WWW-Authenticate": 'Basic realm="infoscreen"'})
+            return
+
+        if settings.failure_rate and fake.rng.random() < settings.failure_rate:
+            fake.record_request(failed=True)
+            self._send(settings.failure_status, "Injected failure")
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        try:
+            days = int(query.get("days", [settings.days])[0])
+            future = int(query.get("future", [0])[0])
+            news = query.get("news", ["1"])[0] != "0"
+        except ValueError:
+            self._send(400, "Bad query")
+            return
+
+        fake.record_request(failed=False)
+        self._send(200, fake.generator.render_page(days=days, future=future, news=news))
+
+    def _is_authorized(self, password: Optional[str]) -> bool:
+        header = self.headers.get("Authorization", "")
+        if not header.startswith("Basic "):
+            return False
+        if password is None:
+            return True
+
+        try:
+            decoded = base64.b64decode(header[len("Basic "):]).decode()
+        except ValueError:
+            return False
+        return decoded.partition(":")[2] == password
+
+    def _send(self, status: int, body: str, headers: Optional[dict[str, str]] = None):
+        payload = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class _InfoportalHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: "FakeInfoportal"
+
+
+class FakeInfoportal:
+    """HTTP server serving generated infoscreen pages on localhost.
+
+    Usable as a context manager; ``url`` can be assigned to
+    ``Config.infoportal_url`` directly.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[FakeInfoportalSettings] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.settings = settings or FakeInfoportalSettings()
+        self.generator = InfoportalHTMLGenerator(self.settings)
+        self.rng = random.Random(self.settings.seed)
+        self.request_count = 0
+        self.failure_count = 0
+
+        self._lock = threading.Lock()
+        self._server = _InfoportalHTTPServer((host, port), _InfoportalRequestHandler)
+        self._server.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/infoscreen/"
+
+    def record_request(self, failed: bool) -> None:
+        with self._lock:
+            self.request_count += 1
+            if failed:
+                self.failure_count += 1
+
+    def start(self) -> "FakeInfoportal":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Fake infoportal listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeInfoportal":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake schule-infoportal server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--rows", type=int, default=40, help="rows per day")
+    parser.add_argument("--news-blocks", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--password", default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    settings = FakeInfoportalSettings(
+        days=args.days,
+        rows_per_day=args.rows,
+        news_blocks=args.news_blocks,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        password=args.password,
+        seed=args.seed,
+    )
+    fake = FakeInfoportal(settings, host=args.host, port=args.port)
+    try:
+        fake.start()
+        fake._thread.join()  # type: ignore
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
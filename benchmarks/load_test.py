@@ -0,0 +1,176 @@
+"""End-to-end load test of the FastAPI app against the fake infoportal.
+
+Starts the fake infoportal and the app (uvicorn) in-process on free local
+ports, drives them with concurrent HTTP clients and reports throughput and
+latency percentiles::
+
+    python -m benchmarks.load_test --requests 2000 --concurrency 16 --users 4
+"""
+
+import argparse
+import itertools
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import requests
+import uvicorn
+
+from benchmarks.fake_infoportal import FakeInfoportal, FakeInfoportalSettings
+
+ENDPOINTS = [
+    "/auth/check",
+    "/substitutions",
+    "/substitutions?class_name=10a",
+    "/substitutions?teacher_name=Müller",
+    "/news",
+    "/last_updated",
+]
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class AppServer:
+    """Runs main.app with uvicorn in a background thread."""
+
+    def __init__(
+        self, infoportal_url: str, days: int, show_news: bool, fan_out: bool = False
+    ):
+        import main
+
+        main.config.infoportal_url = infoportal_url
+        main.config.days = days
+        main.config.show_news = show_news
+        main.config.fetch_days_separately = fan_out
+
+        self.port = _free_port()
+        self._server = uvicorn.Server(
+            uvicorn.Config(main.app, host="127.0.0.1", port=self.port, log_level="warning")
+        )
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> "AppServer":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+
+
+def run(
+    settings: FakeInfoportalSettings,
+    total_requests: int,
+    concurrency: int,
+    users: int,
+    endpoints: Optional[list[str]] = None,
+    fan_out: bool = False,
+) -> None:
+    endpoints = endpoints or ENDPOINTS
+    password = settings.password or "secret"
+
+    with FakeInfoportal(settings) as fake, AppServer(
+        fake.url, settings.days, settings.news_blocks > 0, fan_out
+    ) as app:
+        sessions = threading.local()
+        counter = itertools.count()
+        counter_lock = threading.Lock()
+
+        def send() -> tuple[float, int]:
+            if not hasattr(sessions, "session"):
+                sessions.session = requests.Session()
+            with counter_lock:
+                i = next(counter)
+            endpoint = endpoints[i % len(endpoints)]
+            auth = (f"user{i % users}", password)
+
+            start = time.perf_counter()
+            try:
+                status = sessions.session.get(app.url + endpoint, auth=auth).status_code
+            except requests.exceptions.RequestException:
+                status = 0
+            return time.perf_counter() - start, status
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda _: send(), range(total_requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, status in results if status != 200)
+
+    print(
+        f"{total_requests} requests, concurrency {concurrency}, {users} users, "
+        f"{settings.days} days x {settings.rows_per_day} rows"
+    )
+    print(f"throughput        {total_requests / elapsed:10.1f} req/s")
+    print(f"latency p50       {percentile(latencies, 50) * 1000:10.2f} ms")
+    print(f"latency p90       {percentile(latencies, 90) * 1000:10.2f} ms")
+    print(f"latency p99       {percentile(latencies, 99) * 1000:10.2f} ms")
+    print(f"latency mean      {statistics.mean(latencies) * 1000:10.2f} ms")
+    print(f"errors            {errors:10d}")
+    print(
+        f"upstream requests {fake.request_count:10d} "
+        f"({fake.failure_count} injected failures)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end API load test")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--users", type=int, default=1, help="distinct logins")
+    parser.add_argument("--endpoint", action="append", dest="endpoints")
+    parser.add_argument(
+        "--fan-out", action="store_true", help="fetch each day with its own request"
+    )
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--rows", type=int, default=40, help="rows per day")
+    parser.add_argument("--news-blocks", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    settings = FakeInfoportalSettings(
+        days=args.days,
+        rows_per_day=args.rows,
+        news_blocks=args.news_blocks,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    run(
+        settings,
+        args.requests,
+        args.concurrency,
+        args.users,
+        args.endpoints,
+        fan_out=args.fan_out,
+    )
+
+
+if __name__ == "__main__":
+    main()
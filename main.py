@@ -1,15 +1,19 @@
 import datetime
-from typing import Annotated, List, Optional
+from typing import Annotated, List, NoReturn, Optional
 
-from fastapi import Depends, FastAPI, HTTPException, Query
-from fastapi.responses import FileResponse
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 
 from src.models.api_config import APIConfig
+from src.models.calendar_feed_model import CalendarFeed
 from src.models.config_model import Config
 from src.models.last_update_model import LastUpdated
+from src.models.login_result_model import LoginResult
+from src.models.match_mode_model import MatchMode
 from src.models.news_message_model import NewsMessage
 from src.models.substitution_model import Substitution
+from src.substitution_manager import SubstitutionManager
 from src.substitution_updater import SubstitutionUpdater
 from src.utils.setup_logger import setup_logger
 
@@ -37,14 +41,39 @@ async def api_config():
     return APIConfig()
 
 
+def _client_address(request: Request) -> str:
+    return request.client.host if request.client else ""
+
+
+def _raise_login_error(result: LoginResult) -> NoReturn:
+    if result == LoginResult.limited:
+        raise HTTPException(status_code=429, detail="Too many login attempts")
+    raise HTTPException(status_code=401, detail="Invalid credentials")
+
+
+def get_substitution_manager(
+    credentials: HTTPBasicCredentials, request: Request
+) -> SubstitutionManager:
+    substitution_manager = substitution_updater.get_substitution_manager(
+        config, credentials.username, credentials.password, _client_address(request)
+    )
+    if isinstance(substitution_manager, LoginResult):
+        _raise_login_error(substitution_manager)
+
+    return substitution_manager
+
+
 @app.get("/auth/check")
-async def auth_check(credentials: Annotated[HTTPBasicCredentials, Depends(security)]):
+async def auth_check(
+    credentials: Annotated[HTTPBasicCredentials, Depends(security)],
+    request: Request,
+):
     """Checks if the provided credentials are valid."""
-    substitution_manager = substitution_updater.get_substitution_manager(
-        config, credentials.username, credentials.password
+    result = substitution_updater.verify_credentials(
+        config, credentials.username, credentials.password, _client_address(request)
     )
-    if substitution_manager is None:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if result != LoginResult.accepted:
+        _raise_login_error(result)
 
     return {"message": "Authentication successful"}
 
@@ -55,6 +84,7 @@ async def auth_check(credentials: Annotated[HTTPBasicCredentials, Depends(securi
 @app.get("/substitutions", response_model=List[Substitution])
 async def get_substitutions(
     credentials: Annotated[HTTPBasicCredentials, Depends(security)],
+    request: Request,
     class_name: Optional[str] = Query(None, description="Filter by class name"),
     teacher_name: Optional[str] = Query(None, description="Filter by absent teacher"),
     info: Optional[str] = Query(
@@ -69,6 +99,10 @@ async def get_substitutions(
     end_date: Optional[datetime.date] = Query(
         None, description="End of date range (YYYY-MM-DD)"
     ),
+    match: MatchMode = Query(
+        MatchMode.exact,
+        description="How class_name, teacher_name and info are matched",
+    ),
 ):
     """
     Get substitutions with optional filters:
@@ -77,17 +111,19 @@ async def get_substitutions(
     - info: filter by info field (e.g., 'entfällt')
     - date: filter by exact date
     - start_date + end_date: filter by date range
+    - match: exact (default), normalized (case/umlaut insensitive),
+      prefix (e.g. '10' for all tenth grades) or fuzzy (tolerates typos)
     """
 
-    substitution_manager = substitution_updater.get_substitution_manager(
-        config, credentials.username, credentials.password
-    )
-    if substitution_manager is None:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+    substitution_manager = get_substitution_manager(credentials, request)
 
     if class_name:
         return substitution_manager.get_substitutions_for_class(
-            class_name, date=date, start_date=start_date, end_date=end_date
+            class_name,
+            date=date,
+            start_date=start_date,
+            end_date=end_date,
+            match=match,
         )
 
     if teacher_name:
@@ -97,11 +133,17 @@ async def get_substitutions(
             date=date,
             start_date=start_date,
             end_date=end_date,
+            match=match,
         )
 
     if info:
         return substitution_manager.get_substitutions_with_property(
-            "info", info, date=date, start_date=start_date, end_date=end_date
+            "info",
+            info,
+            date=date,
+            start_date=start_date,
+            end_date=end_date,
+            match=match,
         )
 
     return substitution_manager.get_all_substitutions(
@@ -111,13 +153,12 @@ async def get_substitutions(
 
 # --- News ---
 @app.get("/news", response_model=List[NewsMessage])
-async def get_all_news(credentials: Annotated[HTTPBasicCredentials, Depends(security)]):
+async def get_all_news(
+    credentials: Annotated[HTTPBasicCredentials, Depends(security)],
+    request: Request,
+):
     """Get all news messages."""
-    substitution_manager = substitution_updater.get_substitution_manager(
-        config, credentials.username, credentials.password
-    )
-    if substitution_manager is None:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+    substitution_manager = get_substitution_manager(credentials, request)
 
     return substitution_manager.get_all_news_messages()
 
@@ -125,13 +166,10 @@ async def get_all_news(credentials: Annotated[HTTPBasicCredentials, Depends(secu
 @app.get("/news/today", response_model=List[NewsMessage])
 async def get_today_news(
     credentials: Annotated[HTTPBasicCredentials, Depends(security)],
+    request: Request,
 ):
     """Get today's news messages."""
-    substitution_manager = substitution_updater.get_substitution_manager(
-        config, credentials.username, credentials.password
-    )
-    if substitution_manager is None:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+    substitution_manager = get_substitution_manager(credentials, request)
 
     return substitution_manager.get_news_messages_for_today()
 
@@ -139,29 +177,71 @@ async def get_today_news(
 @app.get("/news/date/{date}", response_model=List[NewsMessage])
 async def get_news_for_date(
     credentials: Annotated[HTTPBasicCredentials, Depends(security)],
+    request: Request,
     date: datetime.date,
 ):
     """Get news messages for a specific date."""
-    substitution_manager = substitution_updater.get_substitution_manager(
-        config, credentials.username, credentials.password
-    )
-    if substitution_manager is None:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+    substitution_manager = get_substitution_manager(credentials, request)
 
     return substitution_manager.get_news_messages_for_date(date)
 
 
+# --- Calendar ---
+def _calendar_response(feed: CalendarFeed, if_none_match: Optional[str]) -> Response:
+    headers = {
+        "ETag": feed.etag,
+        "Cache-Control": f"private, max-age={config.refresh_interval * 60}",
+    }
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if feed.etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+
+    return Response(
+        content=feed.content,
+        media_type="text/calendar; charset=utf-8",
+        headers=headers,
+    )
+
+
+@app.get("/calendar/class/{class_name}.ics", response_class=Response)
+async def get_class_calendar(
+    credentials: Annotated[HTTPBasicCredentials, Depends(security)],
+    request: Request,
+    class_name: str,
+    if_none_match: Optional[str] = Header(None),
+):
+    """Get an iCalendar feed with the substitutions of a class."""
+    substitution_manager = get_substitution_manager(credentials, request)
+
+    return _calendar_response(
+        substitution_manager.get_class_calendar_feed(class_name), if_none_match
+    )
+
+
+@app.get("/calendar/teacher/{teacher_name}.ics", response_class=Response)
+async def get_teacher_calendar(
+    credentials: Annotated[HTTPBasicCredentials, Depends(security)],
+    request: Request,
+    teacher_name: str,
+    if_none_match: Optional[str] = Header(None),
+):
+    """Get an iCalendar feed with the substitutions a teacher is absent for or covers."""
+    substitution_manager = get_substitution_manager(credentials, request)
+
+    return _calendar_response(
+        substitution_manager.get_teacher_calendar_feed(teacher_name), if_none_match
+    )
+
+
 # --- Metadata ---
 @app.get("/last_updated", response_model=LastUpdated)
 async def get_last_updated(
     credentials: Annotated[HTTPBasicCredentials, Depends(security)],
+    request: Request,
 ):
     """Get the last updated time of Schule-Infoportal."""
-    substitution_manager = substitution_updater.get_substitution_manager(
-        config, credentials.username, credentials.password
-    )
-    if substitution_manager is None:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+    substitution_manager = get_substitution_manager(credentials, request)
 
     return substitution_manager.get_last_info_portal_update()
 
@@ -169,12 +249,9 @@ async def get_last_updated(
 @app.get("/internal/last_updated")
 async def get_internal_last_updated(
     credentials: Annotated[HTTPBasicCredentials, Depends(security)],
+    request: Request,
 ):
     """Get the last updated time of the internal API."""
-    substitution_manager = substitution_updater.get_substitution_manager(
-        config, credentials.username, credentials.password
-    )
-    if substitution_manager is None:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+    substitution_manager = get_substitution_manager(credentials, request)
 
     return substitution_manager.get_last_internal_update()
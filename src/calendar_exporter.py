@@ -0,0 +1,111 @@
+import datetime
+import hashlib
+from typing import Optional
+
+from src.models.substitution_model import Substitution
+
+PRODUCT_ID = "-//schule-infoportal-api//Substitutions//DE"
+UID_DOMAIN = "schule-infoportal-api"
+
+
+class CalendarExporter:
+    """Renders substitutions as an iCalendar (RFC 5545) feed of all-day events."""
+
+    def __init__(self, calendar_name: str):
+        self.calendar_name = calendar_name
+
+    def render(
+        self,
+        substitutions: list[Substitution],
+        timestamp: Optional[datetime.datetime] = None,
+    ) -> str:
+        dtstamp = self._format_timestamp(timestamp or datetime.datetime.now())
+
+        lines = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{PRODUCT_ID}",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{self._escape_text(self.calendar_name)}",
+        ]
+        for substitution in substitutions:
+            lines.extend(self._render_event(substitution, dtstamp))
+        lines.append("END:VCALENDAR")
+
+        return "".join(f"{self._fold_line(line)}\r\n" for line in lines)
+
+    @staticmethod
+    def event_uid(substitution: Substitution) -> str:
+        """Stable UID derived from the substitution's identity."""
+        identity = "|".join(str(value) for value in substitution.identity())
+        digest = hashlib.sha1(identity.encode()).hexdigest()
+        return f"{digest}@{UID_DOMAIN}"
+
+    def _render_event(self, substitution: Substitution, dtstamp: str) -> list[str]:
+        start = substitution.date
+        end = start + datetime.timedelta(days=1)
+
+        info = substitution.info or "Vertretung"
+        summary = f"{substitution.period}. Std. {substitution.class_name}: {info}"
+        description = "\n".join(
+            [
+                f"Klasse: {substitution.class_name}",
+                f"Stunde: {substitution.period}",
+                f"Abwesend: {substitution.absent_teacher}",
+                f"Vertretung: {substitution.substitution_teacher}",
+                f"Raum: {substitution.room}",
+                f"Info: {substitution.info}",
+            ]
+        )
+
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:{self.event_uid(substitution)}",
+            f"DTSTAMP:{dtstamp}",
+            f"DTSTART;VALUE=DATE:{start.strftime('%Y%m%d')}",
+            f"DTEND;VALUE=DATE:{end.strftime('%Y%m%d')}",
+            f"SUMMARY:{self._escape_text(summary)}",
+            f"DESCRIPTION:{self._escape_text(description)}",
+        ]
+        if substitution.room:
+            lines.append(f"LOCATION:{self._escape_text(substitution.room)}")
+        lines.extend(["TRANSP:TRANSPARENT", "END:VEVENT"])
+        return lines
+
+    @staticmethod
+    def _format_timestamp(timestamp: datetime.datetime) -> str:
+        # naive timestamps are local time; DTSTAMP must be UTC
+        return timestamp.astimezone(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+    @staticmethod
+    def _escape_text(text: str) -> str:
+        return (
+            text.replace("\\", "\\\\")
+            .replace(";", "\\;")
+            .replace(",", "\\,")
+            .replace("\r\n", "\\n")
+            .replace("\n", "\\n")
+        )
+
+    @staticmethod
+    def _fold_line(line: str) -> str:
+        """Fold lines longer than 75 octets as required by RFC 5545."""
+        encoded = line.encode()
+        if len(encoded) <= 75:
+            return line
+
+        parts = []
+        current: list[str] = []
+        size = 0
+        limit = 75
+        for char in line:
+            char_size = len(char.encode())
+            if size + char_size > limit:
+                parts.append("".join(current))
+                current, size = [], 0
+                limit = 74  # continuation lines start with a space
+            current.append(char)
+            size += char_size
+        parts.append("".join(current))
+        return "\r\n ".join(parts)
@@ -0,0 +1,105 @@
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+
+class CredentialCache:
+    """Remembers which logins the infoportal accepted or rejected.
+
+    Credentials are only stored as HMACs under a per-process random key, so
+    neither plaintext secrets nor offline-crackable hashes are kept. Rejected
+    logins are counted per client address and username, so brute-force
+    attempts can be stopped before they turn into infoportal load without
+    letting one client lock a user out everywhere.
+    """
+
+    def __init__(
+        self,
+        positive_ttl: float = 60 * 60,  # in seconds
+        negative_ttl: float = 5 * 60,  # in seconds
+        max_attempts: int = 5,  # rejected logins per window
+        attempt_window: float = 60,  # in seconds
+        max_entries: int = 10_000,
+    ) -> None:
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.max_attempts = max_attempts
+        self.attempt_window = attempt_window
+        self.max_entries = max_entries
+
+        self._key = secrets.token_bytes(32)
+        self._entries: dict[str, tuple[bool, float]] = {}
+        self._attempts: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def digest(self, username: str, password: Optional[str] = None) -> str:
+        message = username if password is None else f"{username}\0{password}"
+        return hmac.new(self._key, message.encode(), hashlib.sha256).hexdigest()
+
+    def lookup(self, key: str) -> Optional[bool]:
+        """Return the cached verdict for a login digest, or None if unknown/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            valid, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return valid
+
+    def record(self, key: str, username: str, valid: bool, client: str = "") -> None:
+        """Remember the verdict for a login digest; rejections count as attempts."""
+        ttl = self.positive_ttl if valid else self.negative_ttl
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (valid, time.monotonic() + ttl)
+            if not valid:
+                self._record_rejection(username, client)
+            if len(self._entries) > self.max_entries or len(self._attempts) > self.max_entries:
+                self._prune()
+
+    def is_rate_limited(self, username: str, client: str = "") -> bool:
+        """True once client had too many logins for username rejected in the window."""
+        key = self._attempt_key(username, client)
+        with self._lock:
+            attempts = self._attempts.get(key)
+            if not attempts:
+                return False
+
+            self._drop_old_attempts(attempts, time.monotonic())
+            return len(attempts) >= self.max_attempts
+
+    def _attempt_key(self, username: str, client: str) -> str:
+        return self.digest(f"{client}\0{username}")
+
+    def _record_rejection(self, username: str, client: str) -> None:
+        now = time.monotonic()
+        key = self._attempt_key(username, client)
+        attempts = self._attempts.setdefault(key, deque())
+        self._drop_old_attempts(attempts, now)
+        attempts.append(now)
+
+    def _drop_old_attempts(self, attempts: deque[float], now: float) -> None:
+        while attempts and attempts[0] <= now - self.attempt_window:
+            attempts.popleft()
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        self._entries = {
+            key: entry for key, entry in self._entries.items() if entry[1] > now
+        }
+        # still full: drop the oldest entries (dicts keep insertion order)
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+        self._attempts = {
+            key: attempts
+            for key, attempts in self._attempts.items()
+            if attempts and attempts[-1] > now - self.attempt_window
+        }
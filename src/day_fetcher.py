@@ -0,0 +1,189 @@
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from src.models.config_model import Config
+from src.models.news_message_model import NewsMessage
+from src.parser import Parser
+from src.snapshot import Snapshot, SnapshotStore
+from src.utils.setup_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# one pool for all logins, so concurrent refreshes cannot multiply the
+# number of requests sent to the infoportal
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _shared_executor(max_workers: int) -> ThreadPoolExecutor:
+    global _executor, _executor_workers
+
+    max_workers = max(1, max_workers)
+    with _executor_lock:
+        if _executor is None or _executor_workers != max_workers:
+            if _executor is not None:
+                # running fetches finish on the old pool
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="day-fetcher"
+            )
+            _executor_workers = max_workers
+        return _executor
+
+
+class DayState:
+    def __init__(self, fetched_at: datetime.datetime, snapshot: Snapshot):
+        self.fetched_at = fetched_at
+        self.snapshot = snapshot  # parsed day page, shared through the snapshot store
+
+
+class DayFetcher:
+    """Fetches each of the configured days with its own concurrent request.
+
+    Near-term days are refreshed on every update, later days only every
+    ``far_day_refresh_interval`` minutes. A day that fails to load keeps the
+    data of its last successful fetch instead of failing the whole update.
+    Fetched data is kept by date, since offsets point to other dates after
+    midnight. Day pages go through the snapshot store, so a page that another
+    login already fetched is not parsed again.
+    """
+
+    def __init__(self, config: Config, snapshot_store: Optional[SnapshotStore] = None):
+        self.config = config
+        self.snapshot_store = snapshot_store
+        self._days: dict[datetime.date, DayState] = {}
+        self._fetched_at: dict[int, datetime.datetime] = {}
+        self._news: list[NewsMessage] = []
+
+    def due_days(self, now: Optional[datetime.datetime] = None) -> list[int]:
+        now = now or datetime.datetime.now()
+        near_term_days = max(1, self.config.near_term_days)
+        far_interval = datetime.timedelta(minutes=self.config.far_day_refresh_interval)
+
+        due = []
+        for offset in range(self.config.days):
+            fetched_at = self._fetched_at.get(offset)
+            if (
+                offset < near_term_days
+                or fetched_at is None
+                # offsets point to other dates after midnight
+                or fetched_at.date() != now.date()
+                or fetched_at < now - far_interval
+            ):
+                due.append(offset)
+        return due
+
+    def fetch_snapshot(self, username: str, password: str) -> Optional[Snapshot]:
+        """Fetch all due days in parallel and merge them with the last good data.
+
+        Returns None if none of the due days could be fetched. Logins are
+        verified before the first fetch, so this does not guard against
+        rejected credentials.
+        """
+        now = datetime.datetime.now()
+        pages = self._fetch_pages(username, password, self.due_days(now))
+
+        fetched_any = False
+        for offset, raw_html in pages.items():
+            if raw_html is None or not self._store_day(offset, raw_html, now):
+                logger.warning(f"Keeping last good data for day +{offset}")
+                continue
+            fetched_any = True
+
+        if not fetched_any:
+            return None
+
+        # fresh pages replace their dates, other dates keep their last good data
+        for day in [day for day in self._days if day < now.date()]:
+            self._release(self._days.pop(day).snapshot)
+        states = [self._days[day] for day in sorted(self._days)[: self.config.days]]
+
+        last_updates = [
+            state.snapshot.last_info_portal_update
+            for state in states
+            if state.snapshot.last_info_portal_update is not None
+        ]
+        return Snapshot(
+            [sub for state in states for sub in state.snapshot.substitutions],
+            self._news,
+            max(last_updates) if last_updates else None,
+        )
+
+    def release(self) -> None:
+        """Give all day snapshots back to the store, e.g. on eviction."""
+        for state in self._days.values():
+            self._release(state.snapshot)
+        self._days = {}
+        self._fetched_at = {}
+
+    def _store_day(self, offset: int, raw_html: str, now: datetime.datetime) -> bool:
+        day_config = self._day_config(offset)
+        if self.snapshot_store is None:
+            snapshot = self._parse_day(day_config, raw_html)
+        else:
+            snapshot = self.snapshot_store.acquire(
+                raw_html, lambda html: self._parse_day(day_config, html)
+            )
+        if snapshot is None:
+            return False
+
+        # day pages are requested with days=1 and cover a single date
+        day = snapshot.dates[0]
+        replaced = self._days.get(day)
+        self._days[day] = DayState(now, snapshot)
+        if replaced is not None:
+            self._release(replaced.snapshot)
+
+        self._fetched_at[offset] = now
+        if offset == 0 and self.config.show_news:
+            self._news = list(snapshot.news)
+        return True
+
+    @staticmethod
+    def _parse_day(config: Config, raw_html: str) -> Optional[Snapshot]:
+        parser = Parser(config)
+        if not parser.setup_parsing(raw_html):
+            return None
+
+        dates = parser.parse_dates()
+        if not dates:
+            logger.error("No date found in day page")
+            return None
+
+        return Snapshot(
+            parser.parse_substitutions(),
+            parser.parse_news(),
+            parser.parse_last_updated(),
+            dates,
+        )
+
+    def _release(self, snapshot: Snapshot) -> None:
+        if self.snapshot_store is not None:
+            self.snapshot_store.release(snapshot)
+
+    def _fetch_pages(
+        self, username: str, password: str, offsets: list[int]
+    ) -> dict[int, Optional[str]]:
+        if not offsets:
+            return {}
+
+        executor = _shared_executor(self.config.max_parallel_requests)
+        futures = {
+            offset: executor.submit(
+                Parser(self._day_config(offset)).fetch_html,
+                username,
+                password,
+                future=offset,
+            )
+            for offset in offsets
+        }
+        return {offset: future.result() for offset, future in futures.items()}
+
+    def _day_config(self, offset: int) -> Config:
+        # news come with the request for the current day only
+        return self.config.model_copy(
+            update={"days": 1, "show_news": self.config.show_news and offset == 0}
+        )
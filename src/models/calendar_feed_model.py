@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class CalendarFeed(BaseModel):
+    content: str
+    etag: str
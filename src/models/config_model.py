@@ -4,3 +4,8 @@ class Config(BaseModel):
     days: int = 3
     show_news: bool = True
     refresh_interval: int = 5 # in minutes
+    infoportal_url: str = "https://schule-infoportal.de/infoscreen/"
+    fetch_days_separately: bool = False # one concurrent request per day
+    near_term_days: int = 1 # days refreshed on every update when fetching separately
+    far_day_refresh_interval: int = 30 # in minutes
+    max_parallel_requests: int = 4 # concurrent day requests shared by all logins
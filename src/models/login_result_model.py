@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class LoginResult(str, Enum):
+    accepted = "accepted"
+    rejected = "rejected"  # the infoportal refused the login or could not be asked
+    limited = "limited"  # too many rejected logins from this client for the username
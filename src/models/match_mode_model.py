@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class MatchMode(str, Enum):
+    exact = "exact"  # value must be equal
+    normalized = "normalized"  # case and umlaut insensitive, e.g. "mueller" finds "Müller"
+    prefix = "prefix"  # normalized prefix, e.g. "10" finds 10a-10f
+    fuzzy = "fuzzy"  # normalized prefix or a close spelling, e.g. "Muler" finds "Müller"
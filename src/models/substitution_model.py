@@ -1,5 +1,5 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 import datetime
 
 class Substitution(BaseModel):
@@ -15,7 +15,10 @@ class Substitution(BaseModel):
         return f"{self.class_name}: {self.period}, {self.absent_teacher}, {self.substitution_teacher}, {self.room}, {self.info}"
 
     def __hash__(self):
-        return hash((self.class_name, self.period, self.absent_teacher, self.substitution_teacher, self.room, self.info, self.date))
+        return hash(self.identity())
+
+    def identity(self) -> tuple:
+        return (self.class_name, self.period, self.absent_teacher, self.substitution_teacher, self.room, self.info, self.date)
 
     @classmethod
     def from_array(cls, values: list, date: datetime.date):
@@ -44,3 +47,11 @@ class Substitution(BaseModel):
             info=values[5],  # info
             date=date,
         )
+
+    @classmethod
+    def validate_many(cls, records: list[dict]) -> list["Substitution"]:
+        """Validate a whole batch of records in one pydantic call."""
+        return _substitution_list_adapter.validate_python(records)
+
+
+_substitution_list_adapter = TypeAdapter(list[Substitution])
@@ -1,9 +1,10 @@
 import datetime
 import re
+from functools import lru_cache
 from typing import Optional
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString
 from dotenv import load_dotenv
 
 from src.models.config_model import Config
@@ -14,6 +15,49 @@ from src.utils.setup_logger import setup_logger
 logger = setup_logger(__name__)
 load_dotenv()
 
+CLASS_NAME_PATTERN = re.compile(r"(\d+)([a-zA-Z]+)")
+REJECTED_LOGIN_STATUS_CODES = (401, 403)
+
+
+@lru_cache(maxsize=1024)
+def _expand_class_name(class_name: str) -> tuple[str, ...]:
+    """Split merged classes like "10abc" into ("10a", "10b", "10c")."""
+    if not class_name[0].isdigit():
+        # is e.g. Q12 or Q13
+        return (class_name,)
+
+    match = CLASS_NAME_PATTERN.match(class_name)
+    if not match:
+        logger.warning(
+            f"No match found for class name: {class_name} parsing it into one substitution"
+        )
+        return (class_name,)
+
+    grade, letters = match.groups()
+    return tuple(f"{grade}{letter}" for letter in letters)
+
+
+@lru_cache(maxsize=64)
+def _parse_date(date_str: str) -> datetime.date:
+    return datetime.datetime.strptime(date_str, "%d.%m.%Y").date()
+
+
+def _iter_table_rows(table):
+    """Yield the rows of a table without searching the whole subtree."""
+    for child in table.children:
+        if child.name == "tr":
+            yield child
+        elif child.name in ("thead", "tbody", "tfoot"):
+            yield from (row for row in child.children if row.name == "tr")
+
+
+def _cell_text(cell) -> str:
+    contents = cell.contents
+    if len(contents) == 1 and type(contents[0]) is NavigableString:
+        # plain text cell, skip the generic get_text traversal
+        return str(contents[0]).strip()
+    return cell.get_text().strip()
+
 
 class Parser:
     def __init__(self, config: Config):
@@ -22,17 +66,47 @@ class Parser:
         self._soup: Optional[BeautifulSoup] = None
         self._substitution_tables: Optional[list[BeautifulSoup]] = None
         self._news_table: Optional[BeautifulSoup] = None
-
-    def fetch_html(self, username: str, password: str) -> Optional[str]:
-        url = (
-            f"https://schule-infoportal.de/infoscreen/"
-            f"?type=student&days={self.config.days}"
-            f"&future=0&news={int(self.config.show_news)}"
+        # set by fetch_html, so a full fetch can double as the credential check
+        self.login_rejected = False
+
+    def _build_url(self, days: int, show_news: bool, future: int = 0) -> str:
+        return (
+            f"{self.config.infoportal_url}"
+            f"?type=student&days={days}"
+            f"&future={future}&news={int(show_news)}"
             f"&ticker=anfang&absent=&absent2=1"
         )
 
+    def check_credentials(self, username: str, password: str) -> Optional[bool]:
+        """Validate a login with the smallest possible page, without parsing it.
+
+        Returns None if the infoportal could not give an answer.
+        """
+        url = self._build_url(days=1, show_news=False)
+
+        try:
+            # stream so the body is never downloaded, only the status matters
+            with requests.get(url, auth=(username, password), stream=True) as response:
+                if response.status_code == 200:
+                    return True
+                if response.status_code in REJECTED_LOGIN_STATUS_CODES:
+                    return False
+
+                logger.error(f"Failed to check credentials: {response.status_code}")
+                return None
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request failed: {e}")
+            return None
+
+    def fetch_html(
+        self, username: str, password: str, future: int = 0
+    ) -> Optional[str]:
+        url = self._build_url(self.config.days, self.config.show_news, future)
+
         try:
             response = requests.get(url, auth=(username, password))  # type: ignore
+            self.login_rejected = response.status_code in REJECTED_LOGIN_STATUS_CODES
             if response.status_code != 200:
                 logger.error(f"Failed to fetch data: {response.status_code}")
                 return None
@@ -81,6 +155,19 @@ class Parser:
 
         return substitutions
 
+    def parse_dates(self) -> list[datetime.date]:
+        """Dates of the day tables, including days without substitutions."""
+        if not self._substitution_tables:
+            return []
+
+        dates = []
+        for table in self._substitution_tables:
+            header = self._find_date_header(table)
+            if header is not None:
+                dates.append(self._parse_substitution_table_date(header.text.strip()))
+
+        return dates
+
     def parse_news(self) -> list[NewsMessage]:
         return self._parse_news_table(self._news_table) if self._news_table else []
 
@@ -123,86 +210,81 @@ class Parser:
 
     def _parse_substitution_table_date(self, date_str: str) -> datetime.date:
         date_str = date_str.split(",")[1].split("-")[0].strip()
-        return datetime.datetime.strptime(date_str, "%d.%m.%Y").date()
+        return _parse_date(date_str)
 
-    def _parse_substitution_table(self, table) -> list[Substitution]:
+    def _find_date_header(self, table):
         daily_table = table.find("div", class_="container daily_table")
         if not daily_table:
             logger.error("Substitution table not found")
-            return []
+            return None
 
         header = daily_table.find(
             "div", class_="daily_date_hdl week_odd"
         ) or daily_table.find("div", class_="daily_date_hdl week_even")
         if not header:
             logger.error("Date header not found")
+            return None
+
+        return header
+
+    def _parse_substitution_table(self, table) -> list[Substitution]:
+        header = self._find_date_header(table)
+        if header is None:
             return []
 
+        daily_table = header.find_parent("div", class_="container daily_table")
         substitution_date = self._parse_substitution_table_date(header.text.strip())
 
-        rows = (
-            daily_table.find("table").find_all("tr")
-            if daily_table.find("table")
-            else []
-        )
+        table_el = daily_table.find("table")
+        rows = list(_iter_table_rows(table_el)) if table_el else []
         logger.debug(f"Number of rows: {len(rows)}")
 
-        substitutions: list[Substitution] = []
-        for row in rows[1:]:  # skip header
-            cells: list[str] = [cell.text.strip() for cell in row.find_all("td")]
+        cell_rows = [
+            [_cell_text(cell) for cell in row.children if cell.name == "td"]
+            for row in rows[1:]  # skip header
+        ]
+        return self._convert_rows_to_substitutions(cell_rows, substitution_date)
 
+    def _convert_rows_to_substitutions(
+        self, rows: list[list[str]], date: datetime.date
+    ) -> list[Substitution]:
+        """Convert all cell rows of one day table at once.
+
+        Merged classes are expanded from a cache and all records of the table
+        are validated in a single pydantic call instead of one per row.
+        """
+        records: list[dict] = []
+        previous_class_name: Optional[str] = None
+        for cells in rows:
             if len(cells) != 6:
                 logger.error(f"Invalid row format: {cells}")
                 continue
 
             if cells[0] == "":
                 # handle case when class has more than one substitution entry for row
-                prev_sub = substitutions[-1]
-                if prev_sub is None:
+                if previous_class_name is None:
                     logger.error("Previous substitution not found")
                     continue
-
-                substitutions.extend(
-                    self._convert_cells_to_substitutions(
-                        [prev_sub.class_name] + cells[1:],
-                        substitution_date,
-                    )
+                class_names: tuple[str, ...] = (previous_class_name,)
+            else:
+                class_names = _expand_class_name(cells[0])
+
+            _, period, absent_teacher, substitution_teacher, room, info = cells
+            for class_name in class_names:
+                records.append(
+                    {
+                        "class_name": class_name,
+                        "period": period,
+                        "absent_teacher": absent_teacher,
+                        "substitution_teacher": substitution_teacher,
+                        "room": room,
+                        "info": info,
+                        "date": date,
+                    }
                 )
-                continue
-
-            substitutions.extend(
-                self._convert_cells_to_substitutions(cells, substitution_date)
-            )
-
-        return substitutions
-
-    def _convert_cells_to_substitutions(
-        self, cells: list[str], date: datetime.date
-    ) -> list[Substitution]:
-        class_name = cells[0]
-
-        if not class_name.strip():
-            return []
+            previous_class_name = class_names[-1]
 
-        if class_name[0].isdigit():
-            match = re.match(r"(\d+)([a-zA-Z]+)", class_name)
-            if not match:
-                logger.warning(
-                    f"No match found for class name: {class_name} parsing it into one substitution"
-                )
-                return [Substitution.from_array(cells, date)]
-
-            subs = []
-            for cls_t in match.group(2):
-                subs.append(
-                    Substitution.from_array_with_class_name(
-                        cells, f"{match.group(1)}{cls_t}", date
-                    )
-                )
-            return subs
-        else:
-            # is e.g. Q12 or Q13
-            return [Substitution.from_array(cells, date)]
+        return Substitution.validate_many(records)
 
     def _parse_news_table(self, news_table) -> list[NewsMessage]:
         """Parse a news table into a list of NewsMessage objects"""
@@ -219,9 +301,7 @@ class Parser:
                 logger.error("News date missing")
                 continue
 
-            news_date = datetime.datetime.strptime(
-                date_el.text.strip(), "%d.%m.%Y"
-            ).date()
+            news_date = _parse_date(date_el.text.strip())
 
             text_el = block.find("span", class_="news_text")
             if not text_el:
@@ -0,0 +1,142 @@
+import unicodedata
+from collections import defaultdict
+from typing import Optional, Sequence
+
+from src.models.match_mode_model import MatchMode
+
+UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue"})
+
+
+def _strip_accents(text: str) -> str:
+    return "".join(
+        char
+        for char in unicodedata.normalize("NFKD", text)
+        if not unicodedata.combining(char)
+    )
+
+
+def normalize_variants(text: str) -> set[str]:
+    """Casefolded spellings of text: "Müller" -> {"mueller", "muller"}."""
+    folded = " ".join(text.casefold().split())  # casefold also turns ß into ss
+    return {
+        _strip_accents(folded.translate(UMLAUTS)),
+        _strip_accents(folded),
+    }
+
+
+def _edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """Optimal string alignment distance, or None if it exceeds max_distance."""
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+
+    previous_previous: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + cost,
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                # transposed letters count as one typo
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance and min(previous) >= max_distance:
+            return None
+        previous_previous, previous = previous, current
+
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class PrefixTrie:
+    """Maps every prefix of the inserted keys to the keys below it."""
+
+    def __init__(self) -> None:
+        self._children: dict[str, "PrefixTrie"] = {}
+        self._keys: list[str] = []
+
+    def insert(self, key: str) -> None:
+        node = self
+        node._keys.append(key)
+        for char in key:
+            node = node._children.setdefault(char, PrefixTrie())
+            node._keys.append(key)
+
+    def keys_with_prefix(self, prefix: str) -> list[str]:
+        node = self
+        for char in prefix:
+            child = node._children.get(char)
+            if child is None:
+                return []
+            node = child
+        return node._keys
+
+
+class SearchIndex:
+    """Index over one property of a snapshot's substitutions.
+
+    Built once per snapshot; lookups return positions into the indexed
+    sequence and cost O(matches) instead of a scan over all rows.
+    """
+
+    def __init__(self, values: Sequence[str]) -> None:
+        self._exact: dict[str, list[int]] = defaultdict(list)
+        self._normalized: dict[str, set[str]] = defaultdict(set)
+        self._trigrams: dict[str, set[str]] = defaultdict(set)
+        self._trie = PrefixTrie()
+
+        for position, value in enumerate(values):
+            self._exact[value].append(position)
+
+        for value in self._exact:
+            for key in normalize_variants(value):
+                if key not in self._normalized:
+                    self._trie.insert(key)
+                    for gram in _trigrams(key):
+                        self._trigrams[gram].add(key)
+                self._normalized[key].add(value)
+
+    def lookup(self, query: str, mode: MatchMode = MatchMode.exact) -> list[int]:
+        if mode == MatchMode.exact:
+            return list(self._exact.get(query, []))
+
+        keys = normalize_variants(query)
+        if mode == MatchMode.normalized:
+            matched_keys = {key for key in keys if key in self._normalized}
+        elif mode == MatchMode.prefix:
+            matched_keys = self._prefix_keys(keys)
+        else:
+            matched_keys = self._prefix_keys(keys) | self._similar_keys(keys)
+
+        values = {value for key in matched_keys for value in self._normalized[key]}
+        return sorted(position for value in values for position in self._exact[value])
+
+    def _prefix_keys(self, keys: set[str]) -> set[str]:
+        return {match for key in keys for match in self._trie.keys_with_prefix(key)}
+
+    def _similar_keys(self, keys: set[str]) -> set[str]:
+        matches = set()
+        for key in keys:
+            max_distance = 0 if len(key) <= 3 else 1 if len(key) <= 8 else 2
+            if max_distance == 0:
+                continue
+
+            # every edit (or transposition) changes at most 4 trigrams
+            grams = _trigrams(key)
+            shared: dict[str, int] = defaultdict(int)
+            for gram in grams:
+                for candidate in self._trigrams.get(gram, ()):
+                    shared[candidate] += 1
+
+            min_shared = len(grams) - 4 * max_distance
+            for candidate, count in shared.items():
+                if count >= min_shared and _edit_distance(key, candidate, max_distance) is not None:
+                    matches.add(candidate)
+        return matches
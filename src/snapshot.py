@@ -0,0 +1,169 @@
+import datetime
+import hashlib
+import threading
+from typing import Callable, Optional
+
+from src.calendar_exporter import CalendarExporter
+from src.models.calendar_feed_model import CalendarFeed
+from src.models.news_message_model import NewsMessage
+from src.models.substitution_model import Substitution
+from src.search_index import SearchIndex
+from src.utils.setup_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class Snapshot:
+    """Immutable parsed infoportal data plus caches derived from it.
+
+    Snapshots are content addressed by ``version``, so logins that see the
+    same school data can share one instance by reference.
+    """
+
+    def __init__(
+        self,
+        substitutions: list[Substitution],
+        news: list[NewsMessage],
+        last_info_portal_update: Optional[datetime.datetime] = None,
+        dates: Optional[list[datetime.date]] = None,
+    ) -> None:
+        self.substitutions: tuple[Substitution, ...] = tuple(set(substitutions))
+        self.news: tuple[NewsMessage, ...] = tuple(news)
+        self.last_info_portal_update = last_info_portal_update
+        if dates is None:
+            dates = [sub.date for sub in self.substitutions]
+        # days covered, including days without substitutions if known
+        self.dates: tuple[datetime.date, ...] = tuple(sorted(set(dates)))
+        self.version = self._compute_version()
+
+        self._calendar_feeds: dict[tuple[str, str], CalendarFeed] = {}
+        self._search_indexes: dict[str, SearchIndex] = {}
+
+    def _compute_version(self) -> str:
+        """Content hash of the parsed data; identical data yields the same version."""
+        digest = hashlib.sha256()
+        for identity in sorted(
+            "|".join(str(value) for value in sub.identity()) for sub in self.substitutions
+        ):
+            digest.update(identity.encode())
+            digest.update(b"\n")
+        for news in sorted(f"{n.date}|{n.message}" for n in self.news):
+            digest.update(news.encode())
+            digest.update(b"\n")
+        digest.update(str(self.last_info_portal_update).encode())
+        digest.update(",".join(str(day) for day in self.dates).encode())
+        return digest.hexdigest()
+
+    # --- Search ---
+    def get_search_index(self, prop: str) -> SearchIndex:
+        """Index over one substitution property, built on first use."""
+        index = self._search_indexes.get(prop)
+        if index is None:
+            index = SearchIndex([getattr(sub, prop) for sub in self.substitutions])
+            self._search_indexes[prop] = index
+        return index
+
+    # --- Calendar ---
+    def get_calendar_feed(self, kind: str, name: str) -> CalendarFeed:
+        """Render a feed once per snapshot and serve it from cache afterwards.
+
+        Only names that occur in the snapshot are cached, so requests for
+        arbitrary names cannot grow the cache.
+        """
+        key = (kind, name)
+        feed = self._calendar_feeds.get(key)
+        if feed is not None:
+            return feed
+
+        if kind == "class":
+            substitutions = [s for s in self.substitutions if s.class_name == name]
+        else:
+            # teachers want both the lessons they miss and the ones they cover
+            substitutions = [
+                s
+                for s in self.substitutions
+                if name in (s.absent_teacher, s.substitution_teacher)
+            ]
+        substitutions.sort(key=lambda sub: (sub.date, sub.period, sub.class_name))
+
+        content = CalendarExporter(f"Vertretungen {name}").render(
+            substitutions, self.last_info_portal_update
+        )
+        etag = hashlib.sha1(f"{self.version}:{kind}:{name}".encode()).hexdigest()
+
+        feed = CalendarFeed(content=content, etag=f'"{etag}"')
+        if substitutions:
+            self._calendar_feeds[key] = feed
+        return feed
+
+
+class SnapshotStore:
+    """Reference counted registry of shared snapshots.
+
+    Snapshots are looked up by a digest of the raw page first, so identical
+    pages are parsed only once, and by content version second, so pages that
+    differ only in markup still share one snapshot.
+    """
+
+    def __init__(self) -> None:
+        self._snapshots: dict[str, Snapshot] = {}
+        self._ref_counts: dict[str, int] = {}
+        self._page_versions: dict[str, str] = {}
+        # latest page digest per version, so markup changes cannot pile up digests
+        self._version_pages: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def acquire(
+        self, raw_html: str, parse: Callable[[str], Optional[Snapshot]]
+    ) -> Optional[Snapshot]:
+        """Return the shared snapshot for raw_html, parsing it only if unknown."""
+        page_digest = hashlib.sha256(raw_html.encode()).hexdigest()
+
+        with self._lock:
+            version = self._page_versions.get(page_digest)
+            if version is not None:
+                self._ref_counts[version] += 1
+                return self._snapshots[version]
+
+        snapshot = parse(raw_html)
+        if snapshot is None:
+            return None
+
+        shared = self.share(snapshot)
+        with self._lock:
+            if self._snapshots.get(shared.version) is shared:
+                previous_page = self._version_pages.get(shared.version)
+                if previous_page is not None:
+                    self._page_versions.pop(previous_page, None)
+                self._page_versions[page_digest] = shared.version
+                self._version_pages[shared.version] = page_digest
+        return shared
+
+    def share(self, snapshot: Snapshot) -> Snapshot:
+        """Return the stored snapshot with the same content, registering snapshot if new."""
+        with self._lock:
+            shared = self._snapshots.setdefault(snapshot.version, snapshot)
+            if shared is not snapshot:
+                logger.debug(f"Sharing snapshot {shared.version[:12]}")
+            self._ref_counts[shared.version] = self._ref_counts.get(shared.version, 0) + 1
+            return shared
+
+    def release(self, snapshot: Snapshot) -> None:
+        """Drop one reference; the snapshot is forgotten when none remain."""
+        with self._lock:
+            count = self._ref_counts.get(snapshot.version)
+            if count is None or self._snapshots.get(snapshot.version) is not snapshot:
+                return
+
+            if count > 1:
+                self._ref_counts[snapshot.version] = count - 1
+                return
+
+            del self._ref_counts[snapshot.version]
+            del self._snapshots[snapshot.version]
+            page_digest = self._version_pages.pop(snapshot.version, None)
+            if page_digest is not None:
+                self._page_versions.pop(page_digest, None)
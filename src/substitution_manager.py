@@ -1,14 +1,18 @@
 import datetime
 import random
-from typing import Optional
+from typing import Callable, Optional
 
 from requests import auth
 
+from src.day_fetcher import DayFetcher
+from src.models.calendar_feed_model import CalendarFeed
 from src.models.config_model import Config
 from src.models.last_update_model import LastUpdated
+from src.models.match_mode_model import MatchMode
 from src.models.news_message_model import NewsMessage
 from src.models.substitution_model import Substitution
 from src.parser import Parser
+from src.snapshot import Snapshot, SnapshotStore
 from src.utils.setup_logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -25,12 +29,45 @@ class SubstitutionManager:
     ) -> None:
         self.login_username = login_username
         self.authorization = authorization
-        self.substitutions = substitutions
-        self.news = news
-        self.last_info_portal_update = last_info_portal_update
+        self.snapshot = Snapshot(substitutions, news, last_info_portal_update)
         self.last_internal_update: Optional[datetime.datetime] = None
-        self.authorization = authorization
-        self.remove_duplicates()
+        self._snapshot_store: Optional[SnapshotStore] = None
+        self._day_fetcher: Optional[DayFetcher] = None
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        login_username: str,
+        snapshot: Snapshot,
+        authorization: str = "",
+        snapshot_store: Optional[SnapshotStore] = None,
+        day_fetcher: Optional[DayFetcher] = None,
+    ) -> "SubstitutionManager":
+        """Create a manager that shares an already parsed snapshot by reference."""
+        manager = cls.__new__(cls)
+        manager.login_username = login_username
+        manager.authorization = authorization
+        manager.snapshot = snapshot
+        manager.last_internal_update = None
+        manager._snapshot_store = snapshot_store
+        manager._day_fetcher = day_fetcher
+        return manager
+
+    @property
+    def substitutions(self) -> tuple[Substitution, ...]:
+        return self.snapshot.substitutions
+
+    @property
+    def news(self) -> tuple[NewsMessage, ...]:
+        return self.snapshot.news
+
+    @property
+    def last_info_portal_update(self) -> Optional[datetime.datetime]:
+        return self.snapshot.last_info_portal_update
+
+    @property
+    def snapshot_version(self) -> str:
+        return self.snapshot.version
 
     # --- Substitutions ---
     def get_all_substitutions(
@@ -51,9 +88,11 @@ class SubstitutionManager:
         date: Optional[datetime.date] = None,
         start_date: Optional[datetime.date] = None,
         end_date: Optional[datetime.date] = None,
+        match: MatchMode = MatchMode.exact,
     ) -> list[Substitution]:
         """Get substitutions where a property matches a value, optionally filtered by date/range."""
-        filtered = [sub for sub in self.substitutions if getattr(sub, prop) == value]
+        positions = self.snapshot.get_search_index(prop).lookup(value, match)
+        filtered = [self.substitutions[position] for position in positions]
         return self._filter_and_sort_substitutions(
             filtered, date=date, start_date=start_date, end_date=end_date
         )
@@ -64,6 +103,7 @@ class SubstitutionManager:
         date: Optional[datetime.date] = None,
         start_date: Optional[datetime.date] = None,
         end_date: Optional[datetime.date] = None,
+        match: MatchMode = MatchMode.exact,
     ) -> list[Substitution]:
         """Convenience wrapper for filtering by class_name."""
         return self.get_substitutions_with_property(
@@ -72,11 +112,12 @@ class SubstitutionManager:
             date=date,
             start_date=start_date,
             end_date=end_date,
+            match=match,
         )
 
     def _filter_and_sort_substitutions(
         self,
-        substitutions: list[Substitution],
+        substitutions: list[Substitution] | tuple[Substitution, ...],
         date: Optional[datetime.date] = None,
         start_date: Optional[datetime.date] = None,
         end_date: Optional[datetime.date] = None,
@@ -89,11 +130,7 @@ class SubstitutionManager:
                 sub for sub in substitutions if start_date <= sub.date <= end_date
             ]
 
-        substitutions.sort(key=lambda sub: sub.date)
-        return substitutions
-
-    def remove_duplicates(self) -> None:
-        self.substitutions = list(set(self.substitutions))
+        return sorted(substitutions, key=lambda sub: sub.date)
 
     # --- News ---
     def get_all_news_messages(self) -> list[NewsMessage]:
@@ -108,48 +145,121 @@ class SubstitutionManager:
         return self.get_news_messages_for_date(datetime.date.today())
 
     def _sort_news_messages_by_date(
-        self, news_messages: list[NewsMessage]
+        self, news_messages: list[NewsMessage] | tuple[NewsMessage, ...]
     ) -> list[NewsMessage]:
         return sorted(news_messages, key=lambda news: news.date)
 
+    # --- Calendar ---
+    def get_class_calendar_feed(self, class_name: str) -> CalendarFeed:
+        return self._get_calendar_feed("class", class_name)
+
+    def get_teacher_calendar_feed(self, teacher_name: str) -> CalendarFeed:
+        return self._get_calendar_feed("teacher", teacher_name)
+
+    def _get_calendar_feed(self, kind: str, name: str) -> CalendarFeed:
+        return self.snapshot.get_calendar_feed(kind, name)
+
     # --- Data management ---
     @staticmethod
-    def _fetch_and_parse_data(
-        config: Config, username: str, password: str, authorization: str
-    ) -> Optional["SubstitutionManager"]:
+    def _parse_snapshot(config: Config, raw_html: str) -> Optional[Snapshot]:
         parser = Parser(config)
-        success = parser.run(username, password)
-
-        if not success:
+        if not parser.setup_parsing(raw_html):
             return None
 
-        parsed_manager = SubstitutionManager(
-            username,
+        return Snapshot(
             parser.parse_substitutions(),
             parser.parse_news(),
             parser.parse_last_updated(),
-            authorization,
         )
-        parsed_manager.last_internal_update = datetime.datetime.now()
 
-        return parsed_manager
+    @staticmethod
+    def _fetch_snapshot(
+        config: Config,
+        username: str,
+        password: str,
+        snapshot_store: Optional[SnapshotStore] = None,
+        day_fetcher: Optional[DayFetcher] = None,
+        on_rejected: Optional[Callable[[], None]] = None,
+    ) -> Optional[Snapshot]:
+        if day_fetcher is not None:
+            snapshot = day_fetcher.fetch_snapshot(username, password)
+            if snapshot is None or snapshot_store is None:
+                return snapshot
+            return snapshot_store.share(snapshot)
+
+        parser = Parser(config)
+        raw_html = parser.fetch_html(username=username, password=password)
+        if raw_html is None:
+            if parser.login_rejected and on_rejected is not None:
+                on_rejected()
+            return None
+
+        if snapshot_store is None:
+            return SubstitutionManager._parse_snapshot(config, raw_html)
+
+        return snapshot_store.acquire(
+            raw_html, lambda html: SubstitutionManager._parse_snapshot(config, html)
+        )
 
     @classmethod
     def init(
-        cls, config: Config, username: str, password: str, authorization: str
+        cls,
+        config: Config,
+        username: str,
+        password: str,
+        authorization: str,
+        snapshot_store: Optional[SnapshotStore] = None,
+        on_rejected: Optional[Callable[[], None]] = None,
     ) -> Optional["SubstitutionManager"]:
-        return cls._fetch_and_parse_data(config, username, password, authorization)
+        day_fetcher = (
+            DayFetcher(config, snapshot_store) if config.fetch_days_separately else None
+        )
+        snapshot = cls._fetch_snapshot(
+            config, username, password, snapshot_store, day_fetcher, on_rejected
+        )
+        if snapshot is None:
+            return None
+
+        manager = cls.from_snapshot(
+            username, snapshot, authorization, snapshot_store, day_fetcher
+        )
+        manager.last_internal_update = datetime.datetime.now()
+        return manager
 
     def update_data(
         self, config: Config, username: str, password: str, authorization: str
     ) -> bool:
-        fresh_manager = self._fetch_and_parse_data(
-            config, username, password, authorization
+        if not config.fetch_days_separately:
+            if self._day_fetcher is not None:
+                self._day_fetcher.release()
+            self._day_fetcher = None
+        elif self._day_fetcher is None:
+            self._day_fetcher = DayFetcher(config, self._snapshot_store)
+        else:
+            self._day_fetcher.config = config
+
+        snapshot = self._fetch_snapshot(
+            config, username, password, self._snapshot_store, self._day_fetcher
         )
-        if fresh_manager:
-            self.__dict__.update(fresh_manager.__dict__)
-            return True
-        return False
+        if snapshot is None:
+            return False
+
+        self.release_snapshot()
+        self.snapshot = snapshot
+        self.authorization = authorization
+        self.last_internal_update = datetime.datetime.now()
+        return True
+
+    def release_snapshot(self) -> None:
+        """Give the shared snapshot back to its store."""
+        if self._snapshot_store is not None:
+            self._snapshot_store.release(self.snapshot)
+
+    def release(self) -> None:
+        """Give everything held in the snapshot store back, e.g. when evicted."""
+        self.release_snapshot()
+        if self._day_fetcher is not None:
+            self._day_fetcher.release()
 
     def check_updating_data(self) -> bool:
         last_update = self.get_last_internal_update().last_update
@@ -1,10 +1,13 @@
-import hashlib
 from collections import deque
 from datetime import datetime
 from typing import Optional
 
+from src.credential_cache import CredentialCache
 from src.models.config_model import Config
 from src.models.last_update_model import LastUpdated
+from src.models.login_result_model import LoginResult
+from src.parser import Parser
+from src.snapshot import SnapshotStore
 from src.substitution_manager import SubstitutionManager
 from src.utils.setup_logger import setup_logger
 
@@ -14,47 +17,139 @@ logger = setup_logger(__name__)
 class SubstitutionUpdater:
     def __init__(self):
         self.substitution_managers: deque[SubstitutionManager] = deque(maxlen=10)
+        # logins seeing the same school data share one parsed snapshot
+        self.snapshot_store = SnapshotStore()
+        self.credential_cache = CredentialCache()
 
     def get_substitution_manager(
-        self, config: Config, login_username: str, password: str
-    ) -> Optional[SubstitutionManager]:
+        self, config: Config, login_username: str, password: str, client: str = ""
+    ) -> SubstitutionManager | LoginResult:
+        """Return the manager for a login, or why none could be created."""
         # check if should return exmaple substitution manager
-        if login_username == "example" and password == "example":
+        if self._is_example_login(login_username, password):
             return SubstitutionManager(
                 login_username,
                 SubstitutionManager.generate_random_example_substitutions(5),
                 SubstitutionManager.generate_random_news_messages(5),
             )
 
-        login = f"{login_username}:{password}"
-        hashed_login = hashlib.sha256(login.encode()).hexdigest()
+        authorization = self.credential_cache.digest(login_username, password)
 
-        for manager in self.substitution_managers:
-            if manager.authorization == hashed_login:
-                should_update = manager.check_updating_data()
-                if should_update:
-                    logger.info(f"Updating data for user {login_username}")
-                    manager.update_data(config, login_username, password, hashed_login)
+        manager = self._find_substitution_manager(authorization)
+        if manager is not None:
+            should_update = manager.check_updating_data()
+            if should_update:
+                logger.info(f"Updating data for user {login_username}")
+                manager.update_data(config, login_username, password, authorization)
 
-                return manager
+            return manager
 
         return self.create_substitution_manager(
-            config, login_username, password, hashed_login
+            config, login_username, password, authorization, client
+        )
+
+    def verify_credentials(
+        self, config: Config, login_username: str, password: str, client: str = ""
+    ) -> LoginResult:
+        """Check a login, fetching only a minimal page when nothing is cached."""
+        if self._is_example_login(login_username, password):
+            return LoginResult.accepted
+
+        authorization = self.credential_cache.digest(login_username, password)
+        if self._find_substitution_manager(authorization) is not None:
+            return LoginResult.accepted
+
+        cached = self.credential_cache.lookup(authorization)
+        if cached is not None:
+            return LoginResult.accepted if cached else LoginResult.rejected
+
+        if self._is_rate_limited(login_username, client):
+            return LoginResult.limited
+        return self._check_credentials(
+            config, login_username, password, authorization, client
         )
 
     def create_substitution_manager(
-        self, config: Config, login_username: str, password: str, authorization: str
-    ) -> Optional[SubstitutionManager]:
+        self,
+        config: Config,
+        login_username: str,
+        password: str,
+        authorization: str,
+        client: str = "",
+    ) -> SubstitutionManager | LoginResult:
+        known_valid = self.credential_cache.lookup(authorization)
+        if known_valid is False:
+            return LoginResult.rejected
+        if known_valid is None:
+            if self._is_rate_limited(login_username, client):
+                return LoginResult.limited
+            if config.fetch_days_separately:
+                # one cheap check instead of one rejected request per day
+                result = self._check_credentials(
+                    config, login_username, password, authorization, client
+                )
+                if result != LoginResult.accepted:
+                    return result
+
+        # without fan-out the page fetch itself is the credential check
         manager = SubstitutionManager.init(
             config,
             login_username,
             password,
-            authorization=hashlib.sha256(
-                f"{login_username}:{password}".encode()
-            ).hexdigest(),
+            authorization=authorization,
+            snapshot_store=self.snapshot_store,
+            on_rejected=lambda: self.credential_cache.record(
+                authorization, login_username, False, client
+            ),
         )
         if manager is None:
-            return None
+            return LoginResult.rejected
+
+        self.credential_cache.record(authorization, login_username, True)
+
+        if len(self.substitution_managers) == self.substitution_managers.maxlen:
+            evicted = self.substitution_managers.popleft()
+            evicted.release()
 
         self.substitution_managers.append(manager)
         return manager
+
+    def _check_credentials(
+        self,
+        config: Config,
+        login_username: str,
+        password: str,
+        authorization: str,
+        client: str = "",
+    ) -> LoginResult:
+        """Ask the infoportal with one cheap request and remember its verdict."""
+        valid = Parser(config).check_credentials(login_username, password)
+        if valid is None:
+            return LoginResult.rejected
+
+        self.credential_cache.record(authorization, login_username, valid, client)
+        return LoginResult.accepted if valid else LoginResult.rejected
+
+    def _is_rate_limited(self, login_username: str, client: str) -> bool:
+        """True if client may not have another login for this username checked.
+
+        Rejections are counted per client address and username, so wrong
+        passwords sent from another address do not lock the owner out. Logins
+        with a live manager or a cached verdict never get here.
+        """
+        if self.credential_cache.is_rate_limited(login_username, client):
+            logger.warning(f"Too many login attempts for user {login_username}")
+            return True
+        return False
+
+    def _find_substitution_manager(
+        self, authorization: str
+    ) -> Optional[SubstitutionManager]:
+        for manager in self.substitution_managers:
+            if manager.authorization == authorization:
+                return manager
+        return None
+
+    @staticmethod
+    def _is_example_login(login_username: str, password: str) -> bool:
+        return login_username == "example" and password == "example"